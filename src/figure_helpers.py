@@ -6,14 +6,36 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from matplotlib.patches import Patch
 import matplotlib.gridspec as gridspec
+from scipy import stats
+
+mpl.rcParams['font.family'] = 'Helvetica'
 
 
 def billions_formatter(x, pos):
     return f'£{x * 1e-9:.1f}Bn'
 
+def plot_fit(ax, df, x, y, color, ci=99):
+    xs = df[x].to_numpy(dtype=np.float64)
+    ys = df[y].to_numpy(dtype=np.float64)
+    n = len(xs)
+    slope, intercept = np.polyfit(xs, ys, 1)
+    resid = ys - (intercept + slope * xs)
+    mse = resid @ resid / (n - 2)
+    sxx = ((xs - xs.mean()) ** 2).sum()
+    x_pred = np.linspace(xs.min(), xs.max(), 100)
+    y_pred = intercept + slope * x_pred
+    se = np.sqrt(mse * (1 / n + (x_pred - xs.mean()) ** 2 / sxx))
+    t = stats.t.ppf(0.5 + ci / 200, n - 2)
+    ax.fill_between(x_pred, y_pred - t * se, y_pred + t * se, facecolor=color,
+                    edgecolor=(1, 1, 1, 1), alpha=1, zorder=1)
+    ax.plot(x_pred, y_pred, color='k', linewidth=0.5, linestyle='--')
+
+
 def make_figure_one():
-    mpl.rcParams['font.family'] = 'Helvetica'
-    df = pd.read_csv('../data/wrangled/df_clean_merged.csv')
+    df = pd.read_parquet('../data/wrangled/df_clean_merged.parquet',
+                         columns=['Q5', 'Q10', 'Q4_stage', 'Q8_stemshape', 'ICS_GPA',
+                                  'tot_income', 'fte', 'is_redbrick', 'is_oxbridge',
+                                  'is_russell'])
     colors = ['#3288bd', '#d53e4f', '#fee08b']
     fig = plt.figure(figsize=(11, 7))
     outer_gs = gridspec.GridSpec(2, 3, figure=fig)
@@ -29,62 +51,41 @@ def make_figure_one():
     min_val = df['Q10'].min()
     max_val = df['Q10'].max()
     bins = np.linspace(min_val, max_val, 11)
-    sns.histplot(df[df['Q5'] == 'Female']['Q10'], bins=bins, edgecolor='k', alpha=1,
-                 color=colors[0], ax=ax_top, stat='density', legend=True)
-    sns.histplot(df[df['Q5'] == 'Male']['Q10'], bins=bins, edgecolor='k', alpha=1,
-                 color=colors[1], ax=ax_bottom, stat='density', legend=True)
-
-    sns.violinplot(data=df[(df['Q5'] == 'Male') | (df['Q5'] == 'Female')].sort_values('Q4_stage'),
+    for gender, ax, color in [('Female', ax_top, colors[0]), ('Male', ax_bottom, colors[1])]:
+        values = df.loc[df['Q5'] == gender, 'Q10'].dropna().to_numpy()
+        density, edges = np.histogram(values, bins=bins, density=True)
+        ax.bar(edges[:-1], density, width=np.diff(edges), align='edge',
+               color=color, edgecolor='k', alpha=1)
+
+    df_mf = df[df['Q5'].isin(['Male', 'Female'])]
+    sns.violinplot(data=df_mf,
                    palette=colors[0:2], linewidth=0.75, linecolor='k',
-                   x="Q4_stage", y="Q10", hue="Q5", ax=ax0, split=True)
+                   x="Q4_stage", y="Q10", hue="Q5", hue_order=['Female', 'Male'],
+                   ax=ax0, split=True)
 
-    sns.violinplot(data=df[(df['Q5'] == 'Male') | (df['Q5'] == 'Female')],
+    sns.violinplot(data=df_mf,
                    palette=colors[0:2], linewidth=0.75, linecolor='k',
-                   x="Q8_stemshape", y="Q10", hue="Q5", ax=ax1, split=True)
+                   x="Q8_stemshape", y="Q10", hue="Q5", hue_order=['Female', 'Male'],
+                   ax=ax1, split=True)
     for line in ax0.lines:
         line.set_color('black')
     for line in ax1.lines:
         line.set_color('black')
 
-    df_filtered = df[((df['Q10'].notnull()) & (df['ICS_GPA'].notnull()))]
-    sns.regplot(data=df_filtered, x="ICS_GPA", y="Q10", scatter=False, ax=ax2,
-                line_kws={'color': 'k',
-                          'linewidth': 0.5,
-                          'linestyle': '--'}, ci=99)
-    if ax2.collections:
-        ci_poly = ax2.collections[0]
-        ci_poly.set_facecolor(colors[2])
-        ci_poly.set_alpha(1)
-        ci_poly.set_edgecolor((1, 1, 1, 1))
-        ci_poly.set_zorder(1)
+    base = df.loc[df['Q10'].notnull(), ['Q10', 'ICS_GPA', 'tot_income', 'fte',
+                                        'is_redbrick', 'is_oxbridge', 'is_russell']]
+    df_filtered = base.dropna(subset=['ICS_GPA'])
+    plot_fit(ax2, df_filtered, "ICS_GPA", "Q10", colors[2])
     sns.scatterplot(data=df_filtered, x="ICS_GPA", y="Q10", hue="is_redbrick",
                     edgecolor="black", ax=ax2, palette=colors[0:2])
 
-    df_filtered = df[((df['Q10'].notnull()) & (df['tot_income'].notnull()))]
-    sns.regplot(data=df_filtered, x="tot_income", y="Q10", scatter=False, ax=ax3,
-                line_kws={'color': 'k',
-                          'linewidth': 0.5,
-                          'linestyle': '--'}, ci=99)
-    if ax3.collections:
-        ci_poly = ax3.collections[0]
-        ci_poly.set_facecolor(colors[2])
-        ci_poly.set_alpha(1)
-        ci_poly.set_edgecolor((1, 1, 1, 1))
-        ci_poly.set_zorder(1)
+    df_filtered = base.dropna(subset=['tot_income'])
+    plot_fit(ax3, df_filtered, "tot_income", "Q10", colors[2])
     sns.scatterplot(data=df_filtered, x="tot_income", y="Q10", hue="is_oxbridge",
                     edgecolor="black", ax=ax3, palette=colors[0:2])
 
-    df_filtered = df[((df['Q10'].notnull()) & (df['fte'].notnull()))]
-    sns.regplot(data=df_filtered, x="fte", y="Q10", scatter=False, ax=ax4,
-                line_kws={'color': 'k',
-                          'linewidth': 0.5,
-                          'linestyle': '--'}, ci=99)
-    if ax4.collections:
-        ci_poly = ax4.collections[0]
-        ci_poly.set_facecolor(colors[2])
-        ci_poly.set_alpha(1)
-        ci_poly.set_edgecolor((1, 1, 1, 1))
-        ci_poly.set_zorder(1)
+    df_filtered = base.dropna(subset=['fte'])
+    plot_fit(ax4, df_filtered, "fte", "Q10", colors[2])
     sns.scatterplot(data=df_filtered, x="fte", y="Q10", hue="is_russell",
                     edgecolor="black", ax=ax4, palette=colors[0:2])
 
@@ -170,4 +171,4 @@ def make_figure_one():
     ax3.xaxis.set_major_formatter(ticker.FuncFormatter(billions_formatter))
     ax3.xaxis.set_major_locator(ticker.MaxNLocator(nbins=5))
     plt.tight_layout()
-    plt.savefig('../figures/who_wants_impact.pdf', bbox_inches='tight')
\ No newline at end of file
+    plt.savefig('../figures/who_wants_impact.pdf')
\ No newline at end of file
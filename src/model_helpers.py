@@ -2,12 +2,9 @@ import pandas as pd
 import statsmodels.api as sm
 
 def run_OLS(df, dep_var, indep_vars):
-    temp = df
-    for var in indep_vars:
-        temp = temp[temp[var].notnull()]
-    temp = temp[ temp[dep_var].notnull()]
-    y = temp[dep_var]
-    X = temp[indep_vars]
+    temp = df.dropna(subset=list(indep_vars) + [dep_var])
+    y = temp[dep_var].astype(float)
+    X = temp[indep_vars].astype(float)
     X = sm.add_constant(X)
     model = sm.OLS(y, X).fit()
-    print(model.summary())
\ No newline at end of file
+    print(model.summary())